@@ -1,11 +1,45 @@
 import pytest
 import os
-import sys
 import tempfile
 import shutil
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+def pytest_addoption(parser):
+    """Register command line options for optional test groups."""
+    parser.addoption('--run-slow', action='store_true', default=False,
+                     help='run tests marked as slow')
+    parser.addoption('--run-integration', action='store_true', default=False,
+                     help='run tests marked as integration')
+
+def _worker_log_files():
+    """Log files for this pytest-xdist worker (or the main process)."""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    return {
+        'LOG_FILE': f"test_{worker}.log",
+        'PERFORMANCE_LOG_FILE': f"test_performance_{worker}.log",
+    }
+
+def pytest_configure(config):
+    """Point logging at per-worker files before any test module is imported."""
+    # Config reads the log paths at import time, so this must be set before
+    # collection; each xdist worker then writes and rotates its own files
+    os.environ.update(_worker_log_files())
+
+def pytest_unconfigure(config):
+    """Remove this worker's log files."""
+    for log_file in _worker_log_files().values():
+        if os.path.exists(log_file):
+            os.remove(log_file)
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow and integration tests unless explicitly requested."""
+    for marker in ('slow', 'integration'):
+        option = f'--run-{marker}'
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f'needs {option} option to run')
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip)
 
 # Mock environment variables for testing
 @pytest.fixture(scope='session', autouse=True)
@@ -18,13 +52,6 @@ def setup_test_environment():
     os.environ['WEATHER_API_KEY'] = 'test_api_key'
     os.environ['MODEL_PATH'] = 'models/test_model.pkl'
     os.environ['LOG_LEVEL'] = 'DEBUG'
-    os.environ['LOG_FILE'] = 'test.log'
-    
-    yield
-    
-    # Cleanup test log file
-    if os.path.exists('test.log'):
-        os.remove('test.log')
 
 @pytest.fixture
 def temp_dir():
@@ -279,8 +279,39 @@ class RainbowPredictor:
         self.best_model_name = best_model
         logger.logger.info(f"Best model selected: {best_model} (F1: {best_f1:.4f})")
     
-    def predict(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Make prediction for single weather data point"""
+    def build_feature_vector(self, weather_data: Dict[str, Any]) -> np.ndarray:
+        """Build the model input row for a single weather data point"""
+        
+        # Feature engineering
+        features = self.feature_engineer.transform_single_prediction(weather_data)
+        
+        # Ensure all required features are present
+        feature_vector = []
+        for feature_name in self.feature_names:
+            feature_vector.append(features.get(feature_name, 0))
+        
+        # Convert to numpy array
+        return np.array(feature_vector).reshape(1, -1)
+    
+    def predict_proba_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Return rainbow probabilities for a matrix of feature vectors"""
+        
+        if not self.best_model_name or self.best_model_name not in self.models:
+            raise ValueError("No trained model available")
+        
+        # Scale if necessary
+        if self.best_model_name in ['logistic_regression', 'neural_network']:
+            X = self.scalers['standard'].transform(X)
+        
+        model = self.models[self.best_model_name]
+        return model.predict_proba(X)[:, 1]
+    
+    def predict(self, weather_data: Dict[str, Any], batcher=None) -> Dict[str, Any]:
+        """Make prediction for single weather data point
+        
+        When a ``Batcher`` is given, model evaluation is queued so that it can
+        share a single ``predict_proba`` call with concurrent requests.
+        """
         
         if not self.best_model_name or self.best_model_name not in self.models:
             raise ValueError("No trained model available")
@@ -288,24 +319,14 @@ class RainbowPredictor:
         start_time = time.time()
         
         try:
-            # Feature engineering
-            features = self.feature_engineer.transform_single_prediction(weather_data)
-            
-            # Ensure all required features are present
-            feature_vector = []
-            for feature_name in self.feature_names:
-                feature_vector.append(features.get(feature_name, 0))
-            
-            # Convert to numpy array
-            X = np.array(feature_vector).reshape(1, -1)
-            
-            # Scale if necessary
-            if self.best_model_name in ['logistic_regression', 'neural_network']:
-                X = self.scalers['standard'].transform(X)
+            X = self.build_feature_vector(weather_data)
             
             # Make prediction
-            model = self.models[self.best_model_name]
-            probability = model.predict_proba(X)[0, 1]
+            if batcher is not None:
+                future = batcher.submit(X)
+                probability = future.result(timeout=config.PREDICTION_TIMEOUT_MS / 1000)
+            else:
+                probability = self.predict_proba_matrix(X)[0]
             prediction = int(probability >= config.PREDICTION_THRESHOLD)
             
             execution_time = time.time() - start_time
@@ -2,13 +2,15 @@
 Flask API for rainbow prediction service
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
+from flask_compress import Compress
 import os
 import time
 import psutil
 from datetime import datetime, timedelta
 import json
+import orjson
 from typing import Dict, Any
 
 from .predictor import prediction_service
@@ -19,6 +21,14 @@ from ..utils.logger import get_api_logger
 
 logger = get_api_logger()
 
+# Weather fields every prediction request must provide
+_REQUIRED_WEATHER_FIELDS = ('temperature', 'humidity', 'pressure')
+_REQUIRED_WEATHER = frozenset(_REQUIRED_WEATHER_FIELDS)
+
+# Request size limits
+MAX_REQUEST_BYTES = 1 * 1024 * 1024
+MAX_BATCH_SIZE = 100
+
 # Metrics collection
 class MLMetrics:
     def __init__(self):
@@ -71,17 +81,57 @@ ml_metrics = MLMetrics()
 
 # Create Flask app
 app = Flask(__name__)
+# Must be set before the routes below are registered; rules copy it when bound
+app.url_map.strict_slashes = False
 CORS(app)
 
 # Configure Flask
 app.config['JSON_SORT_KEYS'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+
+# Compress larger JSON payloads (forecasts, statistics) for clients that accept it
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+def _json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """Serialize a payload with orjson and wrap it in a JSON response"""
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(
+        body,
+        status=status,
+        mimetype='application/json',
+        headers={'Content-Length': str(len(body))}
+    )
+
+def _json_in() -> Any:
+    """Parse the request body with orjson without caching the raw bytes"""
+    return orjson.loads(request.get_data(cache=False) or b'null')
+
+def _invalid_json_response(error: orjson.JSONDecodeError):
+    """Build the 400 response for an unparseable request body"""
+    return jsonify({
+        'success': False,
+        'error': f'Invalid JSON: {error}'
+    }), 400
 
 @app.before_request
 def log_request():
     """Log incoming requests"""
     logger.logger.info(f"API Request: {request.method} {request.path}")
 
+@app.before_request
+def reject_oversized_request():
+    """Reject bodies over MAX_CONTENT_LENGTH before any handler parses them"""
+    max_length = app.config.get('MAX_CONTENT_LENGTH')
+    if max_length and request.content_length and request.content_length > max_length:
+        return jsonify({
+            'success': False,
+            'error': f'Request too large. Maximum {max_length} bytes.'
+        }), 413
+
 @app.after_request
 def log_response(response):
     """Log outgoing responses"""
@@ -120,7 +170,7 @@ def health_check():
 def predict_rainbow():
     """Predict rainbow probability for given weather conditions"""
     try:
-        data = request.get_json()
+        data = _json_in()
         
         if not data:
             return jsonify({
@@ -138,11 +188,17 @@ def predict_rainbow():
                 'error': 'Weather data is required'
             }), 400
         
+        if not isinstance(weather_data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Weather data must be an object'
+            }), 400
+        
         # Validate required weather fields
-        required_fields = ['temperature', 'humidity', 'pressure']
-        missing_fields = [field for field in required_fields if field not in weather_data]
+        missing = _REQUIRED_WEATHER - weather_data.keys()
         
-        if missing_fields:
+        if missing:
+            missing_fields = [field for field in _REQUIRED_WEATHER_FIELDS if field in missing]
             return jsonify({
                 'success': False,
                 'error': f'Missing required weather fields: {", ".join(missing_fields)}'
@@ -158,6 +214,8 @@ def predict_rainbow():
             'timestamp': datetime.now().isoformat()
         })
         
+    except orjson.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.log_error("predict_endpoint", str(e))
         return jsonify({
@@ -170,7 +228,7 @@ def predict_rainbow():
 def predict_rainbow_batch():
     """Predict rainbow probability for multiple weather conditions"""
     try:
-        data = request.get_json()
+        data = _json_in()
         
         if not data:
             return jsonify({
@@ -187,10 +245,10 @@ def predict_rainbow_batch():
                 'error': 'Weather data list is required'
             }), 400
         
-        if len(weather_data_list) > 100:  # Limit batch size
+        if len(weather_data_list) > MAX_BATCH_SIZE:
             return jsonify({
                 'success': False,
-                'error': 'Batch size too large. Maximum 100 predictions per request.'
+                'error': f'Batch size too large. Maximum {MAX_BATCH_SIZE} predictions per request.'
             }), 400
         
         results = prediction_service.predict_batch(weather_data_list, location)
@@ -204,6 +262,8 @@ def predict_rainbow_batch():
             'timestamp': datetime.now().isoformat()
         })
         
+    except orjson.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.log_error("predict_batch_endpoint", str(e))
         return jsonify({
@@ -216,7 +276,7 @@ def predict_rainbow_batch():
 def predict_rainbow_forecast():
     """Predict rainbow probability for upcoming hours"""
     try:
-        data = request.get_json()
+        data = _json_in()
         
         if not data:
             return jsonify({
@@ -244,12 +304,15 @@ def predict_rainbow_forecast():
             current_weather, forecast_hours, location
         )
         
-        return jsonify({
+        # Forecasts can hold up to 168 hourly predictions, so skip jsonify
+        return _json_response({
             'success': True,
             'data': result,
             'timestamp': datetime.now().isoformat()
         })
         
+    except orjson.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.log_error("predict_forecast_endpoint", str(e))
         return jsonify({
@@ -345,7 +408,7 @@ def get_prediction_statistics():
 def train_model():
     """Train a new model (admin endpoint)"""
     try:
-        data = request.get_json() or {}
+        data = _json_in() or {}
         
         # Get training parameters
         days_back = data.get('days_back', 30)
@@ -384,6 +447,8 @@ def train_model():
             'timestamp': datetime.now().isoformat()
         })
         
+    except orjson.JSONDecodeError as e:
+        return _invalid_json_response(e)
     except Exception as e:
         logger.log_error("train_endpoint", str(e))
         return jsonify({
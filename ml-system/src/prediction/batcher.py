@@ -0,0 +1,115 @@
+"""
+Server-side micro-batching for rainbow predictions
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+import numpy as np
+
+from ..utils.logger import get_prediction_logger
+
+logger = get_prediction_logger()
+
+class _BatchItem:
+    """Single queued prediction request"""
+    
+    __slots__ = ('features', 'future')
+    
+    def __init__(self, features: np.ndarray, future: Future):
+        self.features = features
+        self.future = future
+
+class Batcher:
+    """Collect concurrent prediction requests and evaluate them as one matrix
+    
+    A background worker takes up to ``max_size`` queued feature vectors and
+    calls ``predict_fn`` once on the stacked matrix. The worker only holds a
+    batch open for ``max_wait`` seconds when the previous batch contained
+    more than one request, so a lone caller is never delayed.
+    """
+    
+    def __init__(self,
+                 predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_size: int = 32,
+                 max_wait: float = 0.01):
+        self.predict_fn = predict_fn
+        self.max_size = max(1, max_size)
+        self.max_wait = max(0.0, max_wait)
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._last_batch_size = 0
+    
+    def submit(self, features: np.ndarray) -> Future:
+        """Queue a single feature vector and return a future for its probability"""
+        
+        self._ensure_worker()
+        
+        future = Future()
+        self._queue.put(_BatchItem(np.asarray(features, dtype=float).ravel(), future))
+        return future
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        
+        if self._worker is not None and self._worker.is_alive():
+            return
+        
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='prediction-batcher', daemon=True
+                )
+                self._worker.start()
+    
+    def _drain(self) -> List[_BatchItem]:
+        """Block for the first request, then gather more until full or timed out"""
+        
+        batch = [self._queue.get()]
+        wait = self.max_wait if self._last_batch_size > 1 else 0.0
+        deadline = time.monotonic() + wait
+        
+        while len(batch) < self.max_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        self._last_batch_size = len(batch)
+        return batch
+    
+    def _run(self):
+        """Worker loop"""
+        
+        while True:
+            batch = self._drain()
+            self._process(batch)
+    
+    def _process(self, batch: List[_BatchItem]):
+        """Evaluate a batch and fan the results back out to the futures"""
+        
+        start_time = time.time()
+        
+        try:
+            X = np.vstack([item.features for item in batch])
+            probabilities = self.predict_fn(X)
+        except Exception as e:
+            logger.log_error("batch_inference", str(e))
+            for item in batch:
+                item.future.set_exception(e)
+            return
+        
+        for item, probability in zip(batch, probabilities):
+            item.future.set_result(float(probability))
+        
+        logger.logger.debug(
+            f"Batched inference for {len(batch)} requests in {time.time() - start_time:.3f}s"
+        )
@@ -12,6 +12,7 @@ import redis
 import json
 
 from ..model_training.trainer import RainbowPredictor
+from .batcher import Batcher
 from ..utils.config import config
 from ..utils.database import db_manager
 from ..utils.logger import get_prediction_logger
@@ -25,6 +26,11 @@ class RainbowPredictionService:
         self.predictor = RainbowPredictor()
         self.redis_client = None
         self.model_loaded = False
+        self.batcher = Batcher(
+            self._predict_proba_batch,
+            max_size=config.BATCH_MAX_SIZE,
+            max_wait=config.BATCH_MAX_WAIT_MS / 1000
+        )
         self._initialize_redis()
         self._load_model()
     
@@ -51,11 +57,21 @@ class RainbowPredictionService:
             logger.log_error("model_loading", str(e))
             self.model_loaded = False
     
+    def _predict_proba_batch(self, X: np.ndarray) -> np.ndarray:
+        """Evaluate a stacked feature matrix with the current model"""
+        return self.predictor.predict_proba_matrix(X)
+    
     def predict_rainbow_probability(self, 
                                   weather_data: Dict[str, Any],
                                   location: Optional[Dict[str, float]] = None,
-                                  use_cache: bool = True) -> Dict[str, Any]:
-        """Predict rainbow probability for given weather conditions"""
+                                  use_cache: bool = True,
+                                  batched: bool = True) -> Dict[str, Any]:
+        """Predict rainbow probability for given weather conditions
+        
+        Online requests are routed through the micro-batcher so concurrent
+        callers share one model evaluation. Internal loops pass
+        ``batched=False`` to evaluate directly.
+        """
         
         if not self.model_loaded:
             raise ValueError("No trained model available. Please train a model first.")
@@ -79,7 +95,9 @@ class RainbowPredictionService:
                 weather_data.update(location)
             
             # Make prediction
-            result = self.predictor.predict(weather_data)
+            result = self.predictor.predict(
+                weather_data, batcher=self.batcher if batched else None
+            )
             
             # Add additional metadata
             result.update({
@@ -117,7 +135,9 @@ class RainbowPredictionService:
         try:
             for i, weather_data in enumerate(weather_data_list):
                 try:
-                    result = self.predict_rainbow_probability(weather_data, location, use_cache=False)
+                    result = self.predict_rainbow_probability(
+                        weather_data, location, use_cache=False, batched=False
+                    )
                     result['batch_index'] = i
                     results.append(result)
                 except Exception as e:
@@ -157,7 +177,9 @@ class RainbowPredictionService:
             forecast_weather['timestamp'] = (base_time + timedelta(hours=hour)).isoformat()
             
             try:
-                prediction = self.predict_rainbow_probability(forecast_weather, location, use_cache=False)
+                prediction = self.predict_rainbow_probability(
+                    forecast_weather, location, use_cache=False, batched=False
+                )
                 prediction['forecast_hour'] = hour
                 prediction['forecast_time'] = forecast_weather['timestamp']
                 predictions.append(prediction)
@@ -94,6 +94,11 @@ class Config:
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', 1000))
     BATCH_INTERVAL = int(os.getenv('BATCH_INTERVAL', 3600))  # 1 hour
     
+    # Micro-batching configuration for online predictions
+    BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 32))
+    BATCH_MAX_WAIT_MS = float(os.getenv('BATCH_MAX_WAIT_MS', 10))
+    PREDICTION_TIMEOUT_MS = float(os.getenv('PREDICTION_TIMEOUT_MS', 1000))
+    
     @classmethod
     def get_database_config(cls) -> Dict[str, Any]:
         """Get database configuration"""
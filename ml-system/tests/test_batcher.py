@@ -0,0 +1,86 @@
+"""
+Tests for the prediction micro-batcher
+"""
+
+import pytest
+import numpy as np
+import threading
+
+from src.prediction.batcher import Batcher
+
+
+class RecordingModel:
+    """predict_proba stand-in that records every matrix it receives"""
+    
+    def __init__(self, delay=None):
+        self.calls = []
+        self.delay = delay
+        self.started = threading.Event()
+    
+    def __call__(self, X):
+        self.started.set()
+        if self.delay is not None:
+            self.delay.wait(timeout=1)
+        self.calls.append(X.copy())
+        return X[:, 0] / 100.0
+
+
+class TestBatcher:
+    """Test micro-batching behaviour"""
+    
+    def test_single_request(self):
+        """A lone request is evaluated and resolved"""
+        model = RecordingModel()
+        batcher = Batcher(model, max_size=8, max_wait=0.01)
+        
+        future = batcher.submit(np.array([[42.0, 1.0]]))
+        
+        assert future.result(timeout=1) == pytest.approx(0.42)
+        assert len(model.calls) == 1
+        assert model.calls[0].shape == (1, 2)
+    
+    def test_concurrent_requests_share_model_call(self):
+        """Requests queued while the model is busy are stacked into one matrix"""
+        release = threading.Event()
+        model = RecordingModel(delay=release)
+        batcher = Batcher(model, max_size=8, max_wait=0.01)
+        
+        first = batcher.submit([1.0, 0.0])
+        # Wait until the worker is busy evaluating the first request
+        assert model.started.wait(timeout=1)
+        queued = [batcher.submit([float(i), 0.0]) for i in range(2, 6)]
+        release.set()
+        
+        assert first.result(timeout=1) == pytest.approx(0.01)
+        assert [f.result(timeout=1) for f in queued] == pytest.approx([0.02, 0.03, 0.04, 0.05])
+        assert len(model.calls) == 2
+        assert model.calls[1].shape == (4, 2)
+    
+    def test_batch_size_limit(self):
+        """No model call receives more than max_size rows"""
+        release = threading.Event()
+        model = RecordingModel(delay=release)
+        batcher = Batcher(model, max_size=3, max_wait=0.0)
+        
+        futures = [batcher.submit([float(i), 0.0]) for i in range(7)]
+        release.set()
+        
+        for future in futures:
+            future.result(timeout=1)
+        assert max(len(X) for X in model.calls) <= 3
+        assert sum(len(X) for X in model.calls) == 7
+    
+    def test_model_error_propagates(self):
+        """A failing model call fails every request in the batch"""
+        def failing_model(X):
+            raise ValueError("No trained model available")
+        
+        batcher = Batcher(failing_model)
+        future = batcher.submit([1.0, 2.0])
+        
+        with pytest.raises(ValueError):
+            future.result(timeout=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -7,23 +7,14 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
-import os
-import sys
 
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-try:
-    from data_processing.data_loader import DataLoader
-except ImportError:
-    # Try alternative import path
-    from src.data_processing.data_loader import DataLoader
+from src.data_processing.data_loader import DataLoader
 
 
 @pytest.fixture
 def data_loader():
     """Create DataLoader instance for testing"""
-    with patch('data_processing.data_loader.db_manager') as mock_db:
+    with patch('src.data_processing.data_loader.db_manager') as mock_db:
         loader = DataLoader()
         return loader, mock_db
 
@@ -73,7 +64,7 @@ class TestDataLoaderInitialization:
     
     def test_initialization(self):
         """Test DataLoader initializes correctly"""
-        with patch('data_processing.data_loader.db_manager'):
+        with patch('src.data_processing.data_loader.db_manager'):
             loader = DataLoader()
             assert loader.db_manager is not None
 
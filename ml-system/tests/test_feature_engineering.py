@@ -7,16 +7,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
-import os
-import sys
 
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-try:
-    from model_training.feature_engineering import FeatureEngineer
-except ImportError:
-    from src.model_training.feature_engineering import FeatureEngineer
+from src.model_training.feature_engineering import FeatureEngineer
 
 
 @pytest.fixture
@@ -2,25 +2,122 @@
 Tests for the Rainbow Prediction API
 """
 
+import copy
 import pytest
-import json
-import os
-import sys
+import orjson
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-try:
-    from prediction.api import create_app
-    from prediction.predictor import prediction_service
-except ImportError:
-    from src.prediction.api import create_app
-    from src.prediction.predictor import prediction_service
+from src.prediction.api import create_app, MAX_REQUEST_BYTES
+
+# Keep the endpoint tests on one xdist worker so they share the session app
+pytestmark = pytest.mark.xdist_group("api")
+
+
+def loads(response):
+    """Decode a JSON response body"""
+    return orjson.loads(response.data)
+
+
+_NOW = datetime.now()
+_NOW_ISO = _NOW.isoformat()
+_WEEK_AGO_ISO = (_NOW - timedelta(days=7)).isoformat()
+
+_HEALTH_OK = {
+    'service_status': 'healthy',
+    'model_loaded': True,
+    'redis_connected': True,
+    'database_connected': True,
+    'last_check': _NOW_ISO
+}
+
+_PREDICT_OK = {
+    'probability': 0.75,
+    'prediction': 1,
+    'confidence': 'high',
+    'model_used': 'random_forest',
+    'execution_time': 0.045,
+    'timestamp': _NOW_ISO,
+    'weather_conditions': 'mild, humid, light rain',
+    'recommendation': 'Good chance of rainbow. Keep an eye on the sky and be prepared.',
+    'cached': False
+}
+
+_BATCH_OK = [
+    {
+        'probability': 0.75,
+        'prediction': 1,
+        'confidence': 'high',
+        'batch_index': 0
+    },
+    {
+        'probability': 0.35,
+        'prediction': 0,
+        'confidence': 'medium',
+        'batch_index': 1
+    }
+]
+
+_FORECAST_OK = {
+    'predictions': [
+        {
+            'probability': 0.65,
+            'prediction': 1,
+            'forecast_hour': 0,
+            'forecast_time': _NOW_ISO
+        }
+    ],
+    'peak_windows': [
+        {
+            'start_hour': 0,
+            'end_hour': 2,
+            'max_probability': 0.75,
+            'avg_probability': 0.65,
+            'duration': 3
+        }
+    ],
+    'max_probability': 0.75,
+    'forecast_summary': {
+        'max_probability': 0.75,
+        'avg_probability': 0.55,
+        'peak_hour': 1,
+        'favorable_hours': 8,
+        'total_hours': 24
+    },
+    'generated_at': _NOW_ISO
+}
+
+_STATS_OK = {
+    'period': {
+        'start_date': _WEEK_AGO_ISO,
+        'end_date': _NOW_ISO,
+        'days': 7
+    },
+    'total_predictions': 150,
+    'avg_probability': 0.45,
+    'high_confidence_predictions': 25,
+    'low_confidence_predictions': 45,
+    'predictions_per_day': 21.4
+}
+
+
+def _canned(data):
+    """Service stub returning a fresh deep copy of the canned data per call"""
+    # Every caller gets its own nested lists and dicts, so no test can
+    # mutate the module-level responses another test relies on
+    return lambda *args, **kwargs: copy.deepcopy(data)
+
+
+class _FakeService:
+    """Lightweight prediction service stand-in for the health check"""
+    
+    model_loaded = True
+    
+    def health_check(self):
+        return copy.deepcopy(_HEALTH_OK)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def app():
     """Create test Flask app"""
     app = create_app()
@@ -34,111 +131,55 @@ def client(app):
     return app.test_client()
 
 
-@pytest.fixture
-def mock_prediction_service():
-    """Mock prediction service for isolated testing"""
-    with patch('prediction.api.prediction_service') as mock:
-        # Mock health check
-        mock.health_check.return_value = {
-            'service_status': 'healthy',
-            'model_loaded': True,
-            'redis_connected': True,
-            'database_connected': True,
-            'last_check': datetime.now().isoformat()
-        }
-        
-        # Mock prediction
-        mock.predict_rainbow_probability.return_value = {
-            'probability': 0.75,
-            'prediction': 1,
-            'confidence': 'high',
-            'model_used': 'random_forest',
-            'execution_time': 0.045,
-            'timestamp': datetime.now().isoformat(),
-            'weather_conditions': 'mild, humid, light rain',
-            'recommendation': 'Good chance of rainbow. Keep an eye on the sky and be prepared.',
-            'cached': False
-        }
-        
-        # Mock batch prediction
-        mock.predict_batch.return_value = [
-            {
-                'probability': 0.75,
-                'prediction': 1,
-                'confidence': 'high',
-                'batch_index': 0
-            },
-            {
-                'probability': 0.35,
-                'prediction': 0,
-                'confidence': 'medium',
-                'batch_index': 1
-            }
-        ]
-        
-        # Mock time series prediction
-        mock.predict_time_series.return_value = {
-            'predictions': [
-                {
-                    'probability': 0.65,
-                    'prediction': 1,
-                    'forecast_hour': 0,
-                    'forecast_time': datetime.now().isoformat()
-                }
-            ],
-            'peak_windows': [
-                {
-                    'start_hour': 0,
-                    'end_hour': 2,
-                    'max_probability': 0.75,
-                    'avg_probability': 0.65,
-                    'duration': 3
-                }
-            ],
-            'max_probability': 0.75,
-            'forecast_summary': {
-                'max_probability': 0.75,
-                'avg_probability': 0.55,
-                'peak_hour': 1,
-                'favorable_hours': 8,
-                'total_hours': 24
-            },
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        # Mock statistics
-        mock.get_prediction_statistics.return_value = {
-            'period': {
-                'start_date': (datetime.now() - timedelta(days=7)).isoformat(),
-                'end_date': datetime.now().isoformat(),
-                'days': 7
-            },
-            'total_predictions': 150,
-            'avg_probability': 0.45,
-            'high_confidence_predictions': 25,
-            'low_confidence_predictions': 45,
-            'predictions_per_day': 21.4
-        }
+@pytest.fixture(scope='module')
+def _patched_prediction_service():
+    """Patch the prediction service once for the whole module"""
+    with patch('src.prediction.api.prediction_service') as mock:
+        mock.health_check.side_effect = _canned(_HEALTH_OK)
+        mock.predict_rainbow_probability.side_effect = _canned(_PREDICT_OK)
+        mock.predict_batch.side_effect = _canned(_BATCH_OK)
+        mock.predict_time_series.side_effect = _canned(_FORECAST_OK)
+        mock.get_prediction_statistics.side_effect = _canned(_STATS_OK)
         
         yield mock
 
 
+@pytest.fixture(scope='module')
+def _fake_service():
+    """Shared fake prediction service"""
+    return _FakeService()
+
+
+@pytest.fixture
+def fake_prediction_service(monkeypatch, _fake_service):
+    """Fake prediction service for tests that only inspect responses"""
+    monkeypatch.setattr('src.prediction.api.prediction_service', _fake_service)
+    return _fake_service
+
+
+@pytest.fixture
+def mock_prediction_service(_patched_prediction_service):
+    """Mock prediction service for tests that assert on service calls"""
+    _patched_prediction_service.reset_mock()
+    return _patched_prediction_service
+
+
 class TestHealthEndpoint:
     """Test health check endpoint"""
     
-    def test_health_check_healthy(self, client, mock_prediction_service):
+    def test_health_check_healthy(self, client, fake_prediction_service):
         """Test healthy service response"""
         response = client.get('/health')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['service_status'] == 'healthy'
         assert data['model_loaded'] == True
         assert data['redis_connected'] == True
     
     def test_health_check_unhealthy(self, client):
         """Test unhealthy service response"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.health_check.return_value = {
                 'service_status': 'degraded',
                 'model_loaded': False,
@@ -148,18 +189,18 @@ class TestHealthEndpoint:
             response = client.get('/health')
             
             assert response.status_code == 503
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['service_status'] == 'degraded'
     
     def test_health_check_exception(self, client):
         """Test health check with service exception"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.health_check.side_effect = Exception('Service error')
             
             response = client.get('/health')
             
             assert response.status_code == 500
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['service_status'] == 'error'
 
 
@@ -190,7 +231,7 @@ class TestPredictEndpoint:
                              })
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == True
         assert 'data' in data
         assert data['data']['probability'] == 0.75
@@ -206,7 +247,7 @@ class TestPredictEndpoint:
         response = client.post('/predict')
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'error' in data
     
@@ -215,7 +256,7 @@ class TestPredictEndpoint:
         response = client.post('/predict', json={})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Weather data is required' in data['error']
     
@@ -230,13 +271,27 @@ class TestPredictEndpoint:
                              json={'weather_data': incomplete_weather})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Missing required weather fields' in data['error']
     
+    @pytest.mark.parametrize('weather_data', [
+        ['temperature', 'humidity', 'pressure'],
+        'temperature=22.5',
+    ], ids=['list', 'string'])
+    def test_predict_weather_data_not_object(self, client, weather_data):
+        """Test prediction with weather data that isn't a JSON object"""
+        response = client.post('/predict', 
+                             json={'weather_data': weather_data})
+        
+        assert response.status_code == 400
+        data = loads(response)
+        assert data['success'] == False
+        assert 'Weather data must be an object' in data['error']
+    
     def test_predict_service_exception(self, client):
         """Test prediction with service exception"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.predict_rainbow_probability.side_effect = Exception('Prediction failed')
             
             weather_data = {
@@ -249,7 +304,7 @@ class TestPredictEndpoint:
                                  json={'weather_data': weather_data})
             
             assert response.status_code == 500
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == False
 
 
@@ -275,7 +330,7 @@ class TestBatchPredictEndpoint:
                              json={'weather_data_list': weather_data_list})
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == True
         assert data['data']['count'] == 2
         assert len(data['data']['predictions']) == 2
@@ -287,7 +342,7 @@ class TestBatchPredictEndpoint:
         response = client.post('/predict/batch')
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
     
     def test_batch_predict_empty_list(self, client):
@@ -296,7 +351,7 @@ class TestBatchPredictEndpoint:
                              json={'weather_data_list': []})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Weather data list is required' in data['error']
     
@@ -308,9 +363,22 @@ class TestBatchPredictEndpoint:
                              json={'weather_data_list': large_list})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Batch size too large' in data['error']
+    
+    def test_batch_predict_oversized_body(self, client):
+        """Test batch body over the request limit is rejected unparsed"""
+        padding = 'x' * (MAX_REQUEST_BYTES + 1)
+        
+        response = client.post('/predict/batch', 
+                             data=padding,
+                             content_type='application/json')
+        
+        assert response.status_code == 413
+        data = loads(response)
+        assert data['success'] == False
+        assert 'Request too large' in data['error']
 
 
 class TestForecastEndpoint:
@@ -331,7 +399,7 @@ class TestForecastEndpoint:
                              })
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == True
         assert 'data' in data
         assert 'predictions' in data['data']
@@ -345,7 +413,7 @@ class TestForecastEndpoint:
         response = client.post('/predict/forecast', json={})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Current weather data is required' in data['error']
     
@@ -364,7 +432,7 @@ class TestForecastEndpoint:
                              })
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Forecast hours too large' in data['error']
 
@@ -374,7 +442,7 @@ class TestModelInfoEndpoint:
     
     def test_model_info_success(self, client):
         """Test model info with loaded model"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.model_loaded = True
             mock.predictor.get_model_summary.return_value = {
                 'best_model': 'random_forest',
@@ -385,25 +453,25 @@ class TestModelInfoEndpoint:
             response = client.get('/model/info')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert data['data']['best_model'] == 'random_forest'
     
     def test_model_info_no_model(self, client):
         """Test model info with no loaded model"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.model_loaded = False
             
             response = client.get('/model/info')
             
             assert response.status_code == 404
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == False
             assert 'No model loaded' in data['error']
     
     def test_feature_importance_success(self, client):
         """Test feature importance endpoint"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.model_loaded = True
             mock.predictor.get_feature_importance.return_value = {
                 'temperature': 0.25,
@@ -414,7 +482,7 @@ class TestModelInfoEndpoint:
             response = client.get('/model/feature-importance')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert data['data']['total_features'] == 3
             assert 'feature_importance' in data['data']
@@ -428,7 +496,7 @@ class TestStatisticsEndpoint:
         response = client.get('/statistics?days=7')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == True
         assert data['data']['total_predictions'] == 150
         assert data['data']['period']['days'] == 7
@@ -440,7 +508,7 @@ class TestStatisticsEndpoint:
         response = client.get('/statistics?days=50')
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = loads(response)
         assert data['success'] == False
         assert 'Days parameter too large' in data['error']
 
@@ -450,7 +518,7 @@ class TestTrainEndpoint:
     
     def test_train_success(self, client):
         """Test successful model training"""
-        with patch('prediction.api.RainbowPredictor') as mock_trainer_class:
+        with patch('src.prediction.api.RainbowPredictor') as mock_trainer_class:
             mock_trainer = Mock()
             mock_trainer_class.return_value = mock_trainer
             
@@ -469,20 +537,20 @@ class TestTrainEndpoint:
                                  json={'days_back': 30})
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert 'training_results' in data['data']
             assert 'model_path' in data['data']
     
     def test_train_exception(self, client):
         """Test training with exception"""
-        with patch('prediction.api.RainbowPredictor') as mock_trainer_class:
+        with patch('src.prediction.api.RainbowPredictor') as mock_trainer_class:
             mock_trainer_class.side_effect = Exception('Training failed')
             
             response = client.post('/train')
             
             assert response.status_code == 500
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == False
 
 
@@ -491,7 +559,7 @@ class TestDataSummaryEndpoint:
     
     def test_data_summary_success(self, client):
         """Test data summary endpoint"""
-        with patch('prediction.api.DataLoader') as mock_loader_class:
+        with patch('src.prediction.api.DataLoader') as mock_loader_class:
             mock_loader = Mock()
             mock_loader_class.return_value = mock_loader
             
@@ -514,13 +582,13 @@ class TestDataSummaryEndpoint:
             response = client.get('/data/summary?days=30')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert data['data']['summary']['total_records'] == 1000
     
     def test_data_summary_no_data(self, client):
         """Test data summary with no data"""
-        with patch('prediction.api.DataLoader') as mock_loader_class:
+        with patch('src.prediction.api.DataLoader') as mock_loader_class:
             mock_loader = Mock()
             mock_loader_class.return_value = mock_loader
             
@@ -532,7 +600,7 @@ class TestDataSummaryEndpoint:
             response = client.get('/data/summary')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert 'No data available' in data['data']['message']
 
@@ -542,7 +610,7 @@ class TestConfigEndpoint:
     
     def test_config_success(self, client):
         """Test configuration endpoint"""
-        with patch('prediction.api.config') as mock_config:
+        with patch('src.prediction.api.config') as mock_config:
             mock_config.PREDICTION_THRESHOLD = 0.5
             mock_config.PREDICTION_CACHE_TTL = 300
             mock_config.FEATURE_COLUMNS = ['temperature', 'humidity']
@@ -555,7 +623,7 @@ class TestConfigEndpoint:
             response = client.get('/config')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == True
             assert data['data']['prediction_threshold'] == 0.5
             assert data['data']['cache_ttl'] == 300
@@ -566,13 +634,13 @@ class TestErrorHandling:
     
     def test_global_exception_handler(self, client):
         """Test global exception handler"""
-        with patch('prediction.api.prediction_service') as mock:
+        with patch('src.prediction.api.prediction_service') as mock:
             mock.health_check.side_effect = RuntimeError('Unexpected error')
             
             response = client.get('/health')
             
             assert response.status_code == 500
-            data = json.loads(response.data)
+            data = loads(response)
             assert data['success'] == False
             assert 'error' in data
             assert 'timestamp' in data
@@ -584,6 +652,9 @@ class TestErrorHandling:
                              content_type='application/json')
         
         assert response.status_code == 400
+        data = loads(response)
+        assert data['success'] == False
+        assert 'Invalid JSON' in data['error']
     
     def test_method_not_allowed(self, client):
         """Test method not allowed"""
@@ -3,98 +3,270 @@ End-to-end integration tests for the complete Shiojiri Rainbow Seeker system
 """
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import encode_multipart_formdata
+from urllib3.util.retry import Retry
+import os
 import time
+import uuid
 import json
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from unittest.mock import patch, Mock
-import jwt
-from datetime import datetime, timedelta
 
+try:
+    import aiohttp
+    import pytest_asyncio
+except ImportError:  # optional async client for the concurrency tests
+    aiohttp = pytest_asyncio = None
 
-class TestE2ESystem:
-    """End-to-end tests for the complete system"""
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx.Client(http2=True) needs the httpx[http2] extra
+except ImportError:  # optional HTTP/2 client
+    httpx = None
+
+# The concurrency tests skip when the async client isn't installed
+requires_aiohttp = pytest.mark.skipif(
+    aiohttp is None, reason="aiohttp and pytest-asyncio are required"
+)
+async_fixture = pytest_asyncio.fixture if pytest_asyncio else pytest.fixture
+
+# Transport errors from whichever client a test ends up using
+HTTP_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+
+def _unique():
+    """Collision-free suffix for resources created by the tests"""
+    return uuid.uuid4().hex[:12]
+
+
+# (connect, read) timeout applied to every request that doesn't set its own
+DEFAULT_TIMEOUT = (2, 5)
+
+# Placeholder image attached to every rainbow upload
+_FAKE_IMAGE = ("test.jpg", b"fake_data", "image/jpeg")
+
+
+def _encode_upload(fields):
+    """Pre-encode rainbow fields and the fake image as one multipart body"""
+    form = {
+        key: json.dumps(value) if isinstance(value, dict) else str(value)
+        for key, value in fields.items()
+    }
+    form["image"] = _FAKE_IMAGE
+    body, content_type = encode_multipart_formdata(form)
+    return body, {"Content-Type": content_type}
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies DEFAULT_TIMEOUT to every request"""
     
-    @pytest.fixture
-    def api_base_url(self):
-        """Base URL for API testing"""
-        return "http://localhost:3000/api"
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Shared HTTP session so requests reuse pooled keep-alive connections"""
+    session = TimeoutSession()
+    # Sized for the 20 requests the load tests keep in flight; block rather
+    # than open throwaway connections once the pool is exhausted. Retries
+    # are disabled so failures surface immediately instead of inflating
+    # the measured response times.
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        pool_block=True,
+        max_retries=Retry(total=0, connect=0, read=0, backoff_factor=0)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def http2_client(http):
+    """HTTP/2-capable client; falls back to the shared session without httpx[http2]"""
+    if httpx is None:
+        yield http
+        return
     
-    @pytest.fixture
-    def ml_api_url(self):
-        """ML service URL"""
-        return "http://localhost:5000"
+    # Negotiates HTTP/2 where the server offers it and HTTP/1.1 otherwise
+    with httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+        timeout=httpx.Timeout(DEFAULT_TIMEOUT[1], connect=DEFAULT_TIMEOUT[0])
+    ) as client:
+        yield client
+
+
+@async_fixture
+async def aio_http():
+    """aiohttp session for tests that fire many requests concurrently"""
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def api_base_url():
+    """Base URL for API testing"""
+    return os.environ.get("API_BASE_URL", "http://localhost:3000/api")
+
+
+@pytest.fixture(scope="session")
+def ml_api_url():
+    """ML service URL"""
+    return os.environ.get("ML_API_URL", "http://localhost:5000")
+
+
+@pytest.fixture(scope="session")
+def _require_api(http, api_base_url):
+    """Skip the backend tests up front when the API isn't healthy"""
+    try:
+        health_response = http.get(f"{api_base_url}/../health", timeout=1)
+    except requests.exceptions.RequestException:
+        pytest.skip(f"API not reachable at {api_base_url}")
+    if not health_response.ok:
+        pytest.skip(f"API unhealthy at {api_base_url} ({health_response.status_code})")
+
+
+@pytest.fixture(scope="module")
+def registered_user(http, api_base_url):
+    """Register one user per module and share its credentials"""
+    # Each pytest-xdist worker registers its own shared user
+    user_data = {
+        "name": "E2E Shared User",
+        "email": f"e2e_shared_{_unique()}@example.com",
+        "password": "E2EShared123!"
+    }
     
-    @pytest.fixture
-    def test_user_data(self):
-        """Test user data"""
-        return {
-            "name": "E2E Test User",
-            "email": f"e2e_test_{int(time.time())}@example.com",
-            "password": "E2ETest123!"
-        }
+    register_response = http.post(
+        f"{api_base_url}/auth/register",
+        json=user_data
+    )
+    assert register_response.status_code == 201
+    register_body = register_response.json()
+    assert register_body["success"] == True
+    register_data = register_body["data"]
     
-    @pytest.fixture
-    def test_rainbow_data(self):
-        """Test rainbow data"""
-        return {
-            "title": "E2E Test Rainbow",
-            "description": "A rainbow created during end-to-end testing",
-            "latitude": 36.2048,
-            "longitude": 138.2529,
-            "intensity": 8,
-            "weather_conditions": {
-                "temperature": 22,
-                "humidity": 75,
-                "pressure": 1012
-            }
-        }
+    return {
+        "email": user_data["email"],
+        "password": user_data["password"],
+        "token": register_data["token"],
+        "user_id": register_data["user"]["id"],
+        # Built once and shared by every request made as this user
+        "auth": {"Authorization": f"Bearer {register_data['token']}"}
+    }
+
+
+@pytest.fixture
+def register_users(aio_http, api_base_url):
+    """Register a batch of users concurrently, returning their tokens"""
     
-    def test_complete_user_journey(self, api_base_url, test_user_data, test_rainbow_data):
-        """Test complete user journey from registration to rainbow creation"""
-        
-        # Step 1: User Registration
-        register_response = requests.post(
+    async def register_one(user_data):
+        async with aio_http.post(
             f"{api_base_url}/auth/register",
-            json=test_user_data,
-            headers={"Content-Type": "application/json"}
+            json=user_data
+        ) as response:
+            if response.status != 201:
+                return None
+            return (await response.json())["data"]["token"]
+    
+    async def register(users):
+        return await asyncio.gather(*(register_one(user_data) for user_data in users))
+    
+    return register
+
+
+@pytest.fixture(scope="session")
+def test_rainbow_data():
+    """Test rainbow data"""
+    return {
+        "title": "E2E Test Rainbow",
+        "description": "A rainbow created during end-to-end testing",
+        "latitude": 36.2048,
+        "longitude": 138.2529,
+        "intensity": 8,
+        "weather_conditions": {
+            "temperature": 22,
+            "humidity": 75,
+            "pressure": 1012
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def test_rainbow_upload(test_rainbow_data):
+    """Multipart body for uploading test_rainbow_data, encoded once"""
+    return _encode_upload(test_rainbow_data)
+
+
+@pytest.mark.xdist_group("auth")
+@pytest.mark.usefixtures("_require_api")
+class TestUserJourney:
+    """User journey from registration to rainbow management, step by step"""
+    
+    @pytest.fixture(scope="class")
+    def created_rainbow(self, http, api_base_url, registered_user, test_rainbow_upload):
+        """Create the journey's rainbow sighting and delete it afterwards"""
+        upload_body, upload_headers = test_rainbow_upload
+        rainbow_response = http.post(
+            f"{api_base_url}/rainbow",
+            data=upload_body,
+            headers={**upload_headers, **registered_user["auth"]}
         )
         
-        assert register_response.status_code == 201
-        register_data = register_response.json()
-        assert register_data["success"] == True
-        assert "token" in register_data["data"]
+        assert rainbow_response.status_code == 201
+        rainbow_data = rainbow_response.json()
+        assert rainbow_data["success"] == True
         
-        token = register_data["data"]["token"]
-        user_id = register_data["data"]["user"]["id"]
+        rainbow_id = rainbow_data["data"]["id"]
+        yield rainbow_id
         
-        # Step 2: User Login
-        login_response = requests.post(
+        # Clean up - Delete Rainbow
+        delete_response = http.delete(
+            f"{api_base_url}/rainbow/{rainbow_id}",
+            headers=registered_user["auth"]
+        )
+        assert delete_response.status_code == 200
+    
+    def test_register(self, registered_user):
+        """Test registration returns a token and user id"""
+        assert registered_user["token"]
+        assert registered_user["user_id"] is not None
+    
+    def test_login(self, http, api_base_url, registered_user):
+        """Test login with the registered credentials"""
+        login_response = http.post(
             f"{api_base_url}/auth/login",
             json={
-                "email": test_user_data["email"],
-                "password": test_user_data["password"]
-            },
-            headers={"Content-Type": "application/json"}
+                "email": registered_user["email"],
+                "password": registered_user["password"]
+            }
         )
         
         assert login_response.status_code == 200
         login_data = login_response.json()
         assert login_data["success"] == True
         assert "token" in login_data["data"]
-        
-        # Step 3: Get User Profile
-        profile_response = requests.get(
+    
+    def test_profile(self, http, api_base_url, registered_user):
+        """Test fetching the user profile"""
+        profile_response = http.get(
             f"{api_base_url}/auth/me",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=registered_user["auth"]
         )
         
         assert profile_response.status_code == 200
         profile_data = profile_response.json()
-        assert profile_data["data"]["email"] == test_user_data["email"]
-        
-        # Step 4: Get Weather Data
-        weather_response = requests.get(
+        assert profile_data["data"]["email"] == registered_user["email"]
+    
+    def test_current_weather(self, http, api_base_url, test_rainbow_data):
+        """Test fetching weather data for the sighting location"""
+        weather_response = http.get(
             f"{api_base_url}/weather/current",
             params={
                 "lat": test_rainbow_data["latitude"],
@@ -105,84 +277,60 @@ class TestE2ESystem:
         assert weather_response.status_code == 200
         weather_data = weather_response.json()
         assert "temperature" in weather_data["data"]
-        
-        # Step 5: Create Rainbow Sighting
-        # Simulate file upload
-        files = {"image": ("test_rainbow.jpg", b"fake_image_data", "image/jpeg")}
-        
-        rainbow_response = requests.post(
-            f"{api_base_url}/rainbow",
-            data=test_rainbow_data,
-            files=files,
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert rainbow_response.status_code == 201
-        rainbow_data = rainbow_response.json()
-        assert rainbow_data["success"] == True
-        
-        rainbow_id = rainbow_data["data"]["id"]
-        
-        # Step 6: Get Created Rainbow
-        get_rainbow_response = requests.get(
-            f"{api_base_url}/rainbow/{rainbow_id}",
-            headers={"Authorization": f"Bearer {token}"}
+    
+    def test_get_rainbow(self, http, api_base_url, registered_user, created_rainbow, test_rainbow_data):
+        """Test fetching the created rainbow"""
+        get_rainbow_response = http.get(
+            f"{api_base_url}/rainbow/{created_rainbow}",
+            headers=registered_user["auth"]
         )
         
         assert get_rainbow_response.status_code == 200
         get_rainbow_data = get_rainbow_response.json()
         assert get_rainbow_data["data"]["title"] == test_rainbow_data["title"]
-        
-        # Step 7: Search Nearby Rainbows
-        nearby_response = requests.get(
+    
+    def test_nearby_rainbows(self, http, api_base_url, registered_user, created_rainbow, test_rainbow_data):
+        """Test the created rainbow shows up in a nearby search"""
+        nearby_response = http.get(
             f"{api_base_url}/rainbow/nearby/{test_rainbow_data['latitude']}/{test_rainbow_data['longitude']}",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=registered_user["auth"]
         )
         
         assert nearby_response.status_code == 200
         nearby_data = nearby_response.json()
         assert len(nearby_data["data"]) >= 1
-        
-        # Step 8: Update Rainbow
+    
+    def test_update_rainbow(self, http, api_base_url, registered_user, created_rainbow):
+        """Test updating the created rainbow"""
         update_data = {"title": "Updated E2E Test Rainbow", "intensity": 9}
-        update_response = requests.put(
-            f"{api_base_url}/rainbow/{rainbow_id}",
+        update_response = http.put(
+            f"{api_base_url}/rainbow/{created_rainbow}",
             json=update_data,
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
+            headers=registered_user["auth"]
         )
         
         assert update_response.status_code == 200
         update_result = update_response.json()
         assert update_result["data"]["title"] == update_data["title"]
-        
-        # Step 9: Get Rainbow Statistics
-        stats_response = requests.get(
+    
+    def test_rainbow_stats(self, http, api_base_url, registered_user, created_rainbow):
+        """Test rainbow statistics include the sightings"""
+        stats_response = http.get(
             f"{api_base_url}/rainbow/stats",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=registered_user["auth"]
         )
         
         assert stats_response.status_code == 200
         stats_data = stats_response.json()
         assert "total_sightings" in stats_data["data"]
-        
-        # Step 10: Clean up - Delete Rainbow
-        delete_response = requests.delete(
-            f"{api_base_url}/rainbow/{rainbow_id}",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert delete_response.status_code == 200
+
+
+class TestMLService:
+    """End-to-end tests against the ML service alone"""
     
-    def test_ml_system_integration(self, ml_api_url):
+    def test_ml_system_integration(self, http2_client, ml_api_url):
         """Test ML system integration"""
         
-        # Test ML API health
-        health_response = requests.get(f"{ml_api_url}/health")
-        assert health_response.status_code in [200, 503]  # May not be available
-        
         # Test prediction endpoint
         prediction_payload = {
             "weather_data": {
@@ -198,7 +346,11 @@ class TestE2ESystem:
         }
         
         try:
-            prediction_response = requests.post(
+            # Test ML API health
+            health_response = http2_client.get(f"{ml_api_url}/health")
+            assert health_response.status_code in [200, 503]  # May not be available
+            
+            prediction_response = http2_client.post(
                 f"{ml_api_url}/predict",
                 json=prediction_payload,
                 timeout=10
@@ -208,20 +360,18 @@ class TestE2ESystem:
                 prediction_data = prediction_response.json()
                 assert "probability" in prediction_data["data"]
                 assert 0 <= prediction_data["data"]["probability"] <= 1
-        except requests.exceptions.RequestException:
+        except HTTP_ERRORS:
             # ML service may not be available in test environment
             pytest.skip("ML service not available")
+
+
+@pytest.mark.usefixtures("_require_api")
+class TestE2ESystem:
+    """End-to-end tests for the complete system"""
     
-    def test_notification_workflow(self, api_base_url, test_user_data):
+    def test_notification_workflow(self, http, api_base_url, registered_user):
         """Test notification subscription and sending"""
-        
-        # Register user
-        register_response = requests.post(
-            f"{api_base_url}/auth/register",
-            json=test_user_data
-        )
-        assert register_response.status_code == 201
-        token = register_response.json()["data"]["token"]
+        auth = registered_user["auth"]
         
         # Subscribe to notifications
         subscription_data = {
@@ -229,10 +379,10 @@ class TestE2ESystem:
             "platform": "web"
         }
         
-        subscribe_response = requests.post(
+        subscribe_response = http.post(
             f"{api_base_url}/notification/subscribe",
             json=subscription_data,
-            headers={"Authorization": f"Bearer {token}"}
+            headers=auth
         )
         
         assert subscribe_response.status_code == 200
@@ -241,40 +391,37 @@ class TestE2ESystem:
         notification_data = {
             "title": "E2E Test Notification",
             "message": "This is a test notification from E2E tests",
-            "userId": register_response.json()["data"]["user"]["id"]
+            "userId": registered_user["user_id"]
         }
         
-        send_response = requests.post(
+        send_response = http.post(
             f"{api_base_url}/notification/send",
             json=notification_data,
-            headers={"Authorization": f"Bearer {token}"}
+            headers=auth
         )
         
         assert send_response.status_code == 200
     
-    def test_concurrent_user_operations(self, api_base_url):
+    @requires_aiohttp
+    @pytest.mark.asyncio
+    async def test_concurrent_user_operations(self, aio_http, api_base_url, register_users):
         """Test concurrent user operations"""
         
-        def create_user_and_rainbow(user_index):
-            """Create a user and rainbow sighting"""
-            user_data = {
+        # Register all 5 users concurrently
+        tokens = await register_users([
+            {
                 "name": f"Concurrent User {user_index}",
-                "email": f"concurrent_{user_index}_{int(time.time())}@example.com",
+                "email": f"concurrent_{user_index}_{_unique()}@example.com",
                 "password": "ConcurrentTest123!"
             }
-            
-            # Register user
-            register_response = requests.post(
-                f"{api_base_url}/auth/register",
-                json=user_data
-            )
-            
-            if register_response.status_code != 201:
+            for user_index in range(5)
+        ])
+        
+        async def create_rainbow(user_index, token):
+            """Create a rainbow sighting as the given user"""
+            if token is None:
                 return {"error": "Registration failed", "user_index": user_index}
             
-            token = register_response.json()["data"]["token"]
-            
-            # Create rainbow
             rainbow_data = {
                 "title": f"Concurrent Rainbow {user_index}",
                 "description": f"Rainbow from concurrent user {user_index}",
@@ -283,67 +430,76 @@ class TestE2ESystem:
                 "intensity": (user_index % 10) + 1
             }
             
-            files = {"image": ("test.jpg", b"fake_data", "image/jpeg")}
+            upload_body, upload_headers = _encode_upload(rainbow_data)
+            auth = {"Authorization": f"Bearer {token}"}
             
-            rainbow_response = requests.post(
+            async with aio_http.post(
                 f"{api_base_url}/rainbow",
-                data=rainbow_data,
-                files=files,
-                headers={"Authorization": f"Bearer {token}"}
-            )
+                data=upload_body,
+                headers={**upload_headers, **auth}
+            ) as rainbow_response:
+                rainbow_status = rainbow_response.status
+                rainbow_id = None
+                if rainbow_status == 201:
+                    rainbow_id = (await rainbow_response.json())["data"]["id"]
             
             return {
                 "user_index": user_index,
-                "register_status": register_response.status_code,
-                "rainbow_status": rainbow_response.status_code,
-                "success": rainbow_response.status_code == 201
+                "rainbow_status": rainbow_status,
+                "rainbow_id": rainbow_id,
+                "auth": auth,
+                "success": rainbow_status == 201
             }
         
-        # Test with 5 concurrent users
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [
-                executor.submit(create_user_and_rainbow, i) 
-                for i in range(5)
-            ]
-            
-            results = [future.result() for future in futures]
+        async def delete_rainbow(result):
+            """Delete a rainbow created by the test"""
+            async with aio_http.delete(
+                f"{api_base_url}/rainbow/{result['rainbow_id']}",
+                headers=result["auth"]
+            ) as delete_response:
+                return delete_response.status
+        
+        # Test with 5 concurrent users. Every upload is allowed to finish:
+        # cancelling one in flight could leave a rainbow nobody cleans up
+        results = await asyncio.gather(
+            *(create_rainbow(i, token) for i, token in enumerate(tokens)),
+            return_exceptions=True
+        )
+        created = [
+            result for result in results
+            if isinstance(result, dict) and result.get("success", False)
+        ]
         
-        # Check results
-        successful_operations = sum(1 for result in results if result.get("success", False))
+        # Clean up every rainbow that was created
+        delete_statuses = await asyncio.gather(*(delete_rainbow(result) for result in created))
         
-        assert successful_operations >= 3  # At least 60% success rate
+        assert len(created) >= 3  # At least 60% success rate
+        assert all(status == 200 for status in delete_statuses)
     
-    def test_system_performance_under_load(self, api_base_url):
+    @requires_aiohttp
+    @pytest.mark.asyncio
+    async def test_system_performance_under_load(self, aio_http, api_base_url, registered_user):
         """Test system performance under load"""
+        auth = registered_user["auth"]
         
-        # Create a test user first
-        user_data = {
-            "name": "Performance Test User",
-            "email": f"perf_test_{int(time.time())}@example.com",
-            "password": "PerfTest123!"
-        }
+        request_timeout = aiohttp.ClientTimeout(total=5)
         
-        register_response = requests.post(
-            f"{api_base_url}/auth/register",
-            json=user_data
-        )
-        assert register_response.status_code == 201
-        token = register_response.json()["data"]["token"]
-        
-        def make_api_request():
+        async def make_api_request():
             """Make a simple API request"""
+            request_start = time.perf_counter()
             try:
-                response = requests.get(
+                async with aio_http.get(
                     f"{api_base_url}/rainbow",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=5
-                )
-                return {
-                    "status_code": response.status_code,
-                    "response_time": response.elapsed.total_seconds(),
-                    "success": response.status_code == 200
-                }
-            except requests.exceptions.RequestException as e:
+                    headers=auth,
+                    timeout=request_timeout
+                ) as response:
+                    await response.read()
+                    return {
+                        "status_code": response.status,
+                        "response_time": time.perf_counter() - request_start,
+                        "success": response.status == 200
+                    }
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 return {
                     "status_code": 0,
                     "response_time": 5.0,
@@ -354,9 +510,7 @@ class TestE2ESystem:
         start_time = time.time()
         
         # Make 20 concurrent requests
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(make_api_request) for _ in range(20)]
-            results = [future.result() for future in futures]
+        results = await asyncio.gather(*(make_api_request() for _ in range(20)))
         
         end_time = time.time()
         total_time = end_time - start_time
@@ -372,23 +526,10 @@ class TestE2ESystem:
         assert average_response_time < 2.0  # Average response time under 2 seconds
         assert total_time < 15.0  # All requests complete within 15 seconds
     
-    def test_data_consistency_across_services(self, api_base_url):
+    def test_data_consistency_across_services(self, http, api_base_url, registered_user):
         """Test data consistency across different services"""
-        
-        # Create user and rainbow
-        user_data = {
-            "name": "Consistency Test User",
-            "email": f"consistency_test_{int(time.time())}@example.com",
-            "password": "ConsistencyTest123!"
-        }
-        
-        register_response = requests.post(
-            f"{api_base_url}/auth/register",
-            json=user_data
-        )
-        assert register_response.status_code == 201
-        token = register_response.json()["data"]["token"]
-        user_id = register_response.json()["data"]["user"]["id"]
+        auth = registered_user["auth"]
+        user_id = registered_user["user_id"]
         
         # Create rainbow
         rainbow_data = {
@@ -399,32 +540,39 @@ class TestE2ESystem:
             "intensity": 7
         }
         
-        files = {"image": ("test.jpg", b"fake_data", "image/jpeg")}
-        
-        rainbow_response = requests.post(
+        upload_body, upload_headers = _encode_upload(rainbow_data)
+        rainbow_response = http.post(
             f"{api_base_url}/rainbow",
-            data=rainbow_data,
-            files=files,
-            headers={"Authorization": f"Bearer {token}"}
+            data=upload_body,
+            headers={**upload_headers, **auth}
         )
         assert rainbow_response.status_code == 201
         rainbow_id = rainbow_response.json()["data"]["id"]
         
-        # Verify rainbow appears in different endpoints
+        # Verify rainbow appears in different endpoints; the three reads are
+        # independent, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # 1. Get rainbow by ID
+            get_future = executor.submit(
+                http.get, f"{api_base_url}/rainbow/{rainbow_id}", headers=auth
+            )
+            # 2. Check in rainbow list
+            list_future = executor.submit(
+                http.get, f"{api_base_url}/rainbow", headers=auth
+            )
+            # 3. Check in nearby search
+            nearby_future = executor.submit(
+                http.get,
+                f"{api_base_url}/rainbow/nearby/{rainbow_data['latitude']}/{rainbow_data['longitude']}",
+                headers=auth
+            )
+            get_response = get_future.result()
+            list_response = list_future.result()
+            nearby_response = nearby_future.result()
         
-        # 1. Get rainbow by ID
-        get_response = requests.get(
-            f"{api_base_url}/rainbow/{rainbow_id}",
-            headers={"Authorization": f"Bearer {token}"}
-        )
         assert get_response.status_code == 200
         rainbow_detail = get_response.json()["data"]
         
-        # 2. Check in rainbow list
-        list_response = requests.get(
-            f"{api_base_url}/rainbow",
-            headers={"Authorization": f"Bearer {token}"}
-        )
         assert list_response.status_code == 200
         rainbow_list = list_response.json()["data"]
         
@@ -434,11 +582,6 @@ class TestE2ESystem:
         )
         assert rainbow_in_list
         
-        # 3. Check in nearby search
-        nearby_response = requests.get(
-            f"{api_base_url}/rainbow/nearby/{rainbow_data['latitude']}/{rainbow_data['longitude']}",
-            headers={"Authorization": f"Bearer {token}"}
-        )
         assert nearby_response.status_code == 200
         nearby_list = nearby_response.json()["data"]
         
@@ -452,11 +595,11 @@ class TestE2ESystem:
         assert rainbow_detail["title"] == rainbow_data["title"]
         assert rainbow_detail["user_id"] == user_id
     
-    def test_error_handling_and_recovery(self, api_base_url):
+    def test_error_handling_and_recovery(self, http, api_base_url):
         """Test system error handling and recovery"""
         
         # Test with invalid authentication
-        invalid_auth_response = requests.get(
+        invalid_auth_response = http.get(
             f"{api_base_url}/rainbow",
             headers={"Authorization": "Bearer invalid-token"}
         )
@@ -465,14 +608,14 @@ class TestE2ESystem:
         # Test with malformed request data
         malformed_data = {"invalid": "json", "structure": [1, 2, None]}
         
-        malformed_response = requests.post(
+        malformed_response = http.post(
             f"{api_base_url}/auth/register",
             json=malformed_data
         )
         assert malformed_response.status_code == 400
         
         # Test with non-existent resources
-        not_found_response = requests.get(
+        not_found_response = http.get(
             f"{api_base_url}/rainbow/999999"
         )
         assert not_found_response.status_code == 404
@@ -480,17 +623,20 @@ class TestE2ESystem:
         # Test system recovery after errors
         valid_user_data = {
             "name": "Recovery Test User",
-            "email": f"recovery_test_{int(time.time())}@example.com",
+            "email": f"recovery_test_{_unique()}@example.com",
             "password": "RecoveryTest123!"
         }
         
-        recovery_response = requests.post(
+        recovery_response = http.post(
             f"{api_base_url}/auth/register",
             json=valid_user_data
         )
         assert recovery_response.status_code == 201
     
-    def test_security_measures(self, api_base_url):
+    # Shares a worker with the user journey so the failed-login burst can't
+    # rate limit that test's login from a parallel worker
+    @pytest.mark.xdist_group("auth")
+    def test_security_measures(self, http, api_base_url):
         """Test security measures"""
         
         # Test SQL injection attempts
@@ -499,7 +645,7 @@ class TestE2ESystem:
             "password": "password123"
         }
         
-        sql_injection_response = requests.post(
+        sql_injection_response = http.post(
             f"{api_base_url}/auth/login",
             json=sql_injection_payload
         )
@@ -509,11 +655,11 @@ class TestE2ESystem:
         # Test XSS attempts
         xss_payload = {
             "name": "<script>alert('xss')</script>",
-            "email": f"xss_test_{int(time.time())}@example.com",
+            "email": f"xss_test_{_unique()}@example.com",
             "password": "XSSTest123!"
         }
         
-        xss_response = requests.post(
+        xss_response = http.post(
             f"{api_base_url}/auth/register",
             json=xss_payload
         )
@@ -524,21 +670,23 @@ class TestE2ESystem:
             assert "<script>" not in user_data["name"]
         
         # Test rate limiting (if implemented)
-        for _ in range(10):
-            requests.post(
-                f"{api_base_url}/auth/login",
-                json={"email": "test@test.com", "password": "wrong"}
-            )
+        # Only the number of failed attempts matters, so send them concurrently
+        failed_login = {"email": "test@test.com", "password": "wrong"}
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(
+                lambda _: http.post(f"{api_base_url}/auth/login", json=failed_login),
+                range(10)
+            ))
         
         # After multiple failed attempts, should get rate limited
-        final_attempt = requests.post(
+        final_attempt = http.post(
             f"{api_base_url}/auth/login",
-            json={"email": "test@test.com", "password": "wrong"}
+            json=failed_login
         )
         # Should be either rejected or rate limited
         assert final_attempt.status_code in [401, 429]
     
-    def test_api_versioning_and_backward_compatibility(self, api_base_url):
+    def test_api_versioning_and_backward_compatibility(self, http, api_base_url):
         """Test API versioning and backward compatibility"""
         
         # Test that API works with different accept headers
@@ -548,78 +696,70 @@ class TestE2ESystem:
             {"Content-Type": "application/json"},
         ]
         
-        for headers in headers_variants:
-            response = requests.get(
-                f"{api_base_url}/health",
-                headers=headers
-            )
+        # The variants are independent, so check them in one concurrent sweep
+        with ThreadPoolExecutor(max_workers=len(headers_variants)) as executor:
+            responses = list(executor.map(
+                lambda headers: http.get(f"{api_base_url}/health", headers=headers),
+                headers_variants
+            ))
+        
+        for response in responses:
             assert response.status_code in [200, 404]  # Health endpoint may not exist
     
-    def test_monitoring_and_metrics_endpoints(self, api_base_url):
+    def test_monitoring_and_metrics_endpoints(self, http, api_base_url):
         """Test monitoring and metrics endpoints"""
         
         # Test health endpoint
-        health_response = requests.get(f"{api_base_url}/../health")
+        health_response = http.get(f"{api_base_url}/../health")
         if health_response.status_code == 200:
             health_data = health_response.json()
             assert "status" in health_data
         
         # Test metrics endpoint
-        metrics_response = requests.get(f"{api_base_url}/../metrics")
+        metrics_response = http.get(f"{api_base_url}/../metrics")
         if metrics_response.status_code == 200:
             # Could be JSON or Prometheus format
             assert len(metrics_response.text) > 0
 
 
+@pytest.mark.usefixtures("_require_api")
 class TestSystemResilience:
     """Test system resilience and fault tolerance"""
     
-    def test_service_degradation(self, api_base_url):
+    def test_service_degradation(self, http, api_base_url):
         """Test graceful degradation when services are unavailable"""
         
         # This would test how the system behaves when ML service is down
         # or when database is slow, etc.
         
         # For now, just test that basic endpoints still work
-        response = requests.get(f"{api_base_url}/../health")
+        response = http.get(f"{api_base_url}/../health")
         
         # System should remain functional even if some components fail
         assert response.status_code in [200, 503]
     
-    def test_data_backup_and_recovery(self, api_base_url):
+    def test_data_backup_and_recovery(self, http, api_base_url, registered_user):
         """Test data backup and recovery procedures"""
         
         # This would be more comprehensive in a real environment
         # For now, just ensure basic CRUD operations work
-        
-        user_data = {
-            "name": "Backup Test User",
-            "email": f"backup_test_{int(time.time())}@example.com",
-            "password": "BackupTest123!"
-        }
-        
-        # Create
-        create_response = requests.post(
-            f"{api_base_url}/auth/register",
-            json=user_data
-        )
-        assert create_response.status_code == 201
-        
-        token = create_response.json()["data"]["token"]
+        # Create: the shared user was registered by the fixture
+        auth = registered_user["auth"]
         
         # Read
-        read_response = requests.get(
+        read_response = http.get(
             f"{api_base_url}/auth/me",
-            headers={"Authorization": f"Bearer {token}"}
+            headers=auth
         )
         assert read_response.status_code == 200
+        assert read_response.json()["data"]["email"] == registered_user["email"]
         
         # Update (if endpoint exists)
-        update_data = {"name": "Updated Backup Test User"}
-        update_response = requests.put(
+        update_data = {"name": "Updated E2E Shared User"}
+        update_response = http.put(
             f"{api_base_url}/auth/me",
             json=update_data,
-            headers={"Authorization": f"Bearer {token}"}
+            headers=auth
         )
         # May not be implemented
         assert update_response.status_code in [200, 404, 405]